@@ -61,13 +61,8 @@ def makeVelArrayZvec(prob_hi, prob_lo, n, velfunc, verbose=False):
         y = prob_lo[1] + (j+0.5)*dx[1]
         z = prob_lo[2] + (k+0.5)*dx[2]
         uvec[k] = velfunc(x,y,z)
-    for i in range(n[0]):
-        if verbose:
-            progress(i+1, n[0])
-            #count = i*n[1]*n[2]
-            #progress(count+1, n[0]*n[1]*n[2])
-        for j in range(n[1]):
-            u[i,j,:] = uvec
+    # Broadcast the z-profile across all (i,j) columns in one assignment
+    u[:,:,:] = uvec[np.newaxis, np.newaxis, :]
     if verbose: print('')
     return u
 
@@ -119,12 +114,14 @@ def makeIC_fromMMC(prob_lo, prob_hi, n_cell, udata, vdata, Tdata,
     provided
     """
     interpfunc = lambda zdat, fdat, x, y, z: np.interp(z, zdat, fdat)
-    # Get the initial profiles from MMC data
-    uinit, vinit, Tinit = [], [], []
-    for zi, z in enumerate(zMMC):
-        uinit.append(np.interp(tstart, MMCtime, udata[:,zi]))
-        vinit.append(np.interp(tstart, MMCtime, vdata[:,zi]))
-        Tinit.append(np.interp(tstart, MMCtime, Tdata[:,zi]))
+    # Get the initial profiles from MMC data.  One interpolant per field
+    # (axis=0 handles all heights at once) instead of one np.interp per height
+    interpinit = lambda fdat: interpolate.interp1d(MMCtime, fdat, axis=0,
+                                                   bounds_error=False,
+                                                   fill_value=(fdat[0], fdat[-1]))(tstart)
+    uinit = interpinit(udata)
+    vinit = interpinit(vdata)
+    Tinit = interpinit(Tdata)
 
     # Get the inital profile functions
     ufunc = partial(interpfunc, zMMC, uinit)
@@ -175,30 +172,22 @@ def makeMMCforcing(probe_lo, probe_hi, n_cell, udata, vdata, Tdata,
     dsize     = rootgrp.createDimension("datasize", datasize)
     print("Wrote heights and times")
 
-    # Add momentum u profiles
-    nc_momu     = rootgrp.createVariable("momentum_u", "f8", 
+    # Add momentum u profiles (one spline over all times via axis=1,
+    # rather than constructing a CubicSpline per time row)
+    nc_momu     = rootgrp.createVariable("momentum_u", "f8",
                                          ("ntime", "nheight",))
-    for i in range(len(times)):
-        #nc_momu[i,:] = np.interp(zamr, zMMC, udata[i,:])
-        spl = CubicSpline(zMMC, udata[i,:])
-        nc_momu[i,:] = spl(zamr)
+    nc_momu[:,:] = CubicSpline(zMMC, udata, axis=1)(zamr)
 
     # Add momentum v profiles
-    nc_momv     = rootgrp.createVariable("momentum_v", "f8", 
+    nc_momv     = rootgrp.createVariable("momentum_v", "f8",
                                          ("ntime", "nheight",))
-    for i in range(len(times)):
-        #nc_momv[i,:] = np.interp(zamr, zMMC, vdata[i,:])
-        spl = CubicSpline(zMMC, vdata[i,:])
-        nc_momv[i,:] = spl(zamr)
+    nc_momv[:,:] = CubicSpline(zMMC, vdata, axis=1)(zamr)
     print("Wrote momentum profiles")
 
     # Add the temperature profiles
-    nc_temp     = rootgrp.createVariable("temperature", "f8", 
+    nc_temp     = rootgrp.createVariable("temperature", "f8",
                                          ("ntime", "nheight",))
-    for i in range(len(times)):
-        #nc_temp[i,:] = np.interp(zamr, zMMC, Tdata[i,:])
-        spl = CubicSpline(zMMC, Tdata[i,:])
-        nc_temp[i,:] = spl(zamr)
+    nc_temp[:,:] = CubicSpline(zMMC, Tdata, axis=1)(zamr)
     print("Wrote temperature profiles")
 
     # Add the temperature fluxes
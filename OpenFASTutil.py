@@ -7,38 +7,61 @@
 #
 
 import sys, os, re
-from collections            import OrderedDict 
+from collections            import OrderedDict
+from concurrent.futures     import ThreadPoolExecutor
+from itertools              import islice
 import numpy as np
-import fileinput
+import pandas as pd
+import shutil
 
 scriptpath = os.path.dirname(os.path.realpath(__file__))
 utilpath   = os.path.join(scriptpath, 'utilities')
 sys.path.insert(1, utilpath)
 import findOFversion as findOFversion
 
+# Precompiled tokenizer for FAST input lines (avoids the re module cache
+# lookup on every line)
+_SPLIT_RE = re.compile(r'[, ;]+')
+# Characters which mark a comment line in FAST input files
+_COMMENT_FIRSTCHAR = frozenset('=#')
+# Matches ordinary ints/floats (with optional exponent)
+_NUMBER_RE = re.compile(r'[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?$')
+# Extracts the DISCON keyword: the text between the first '!' and the
+# following '-' (or a second '!')
+_DISCON_KEY_RE = re.compile(r'!([^!\-]*)')
+
 def is_number(s):
+    # Fast path: plain ints/floats match the precompiled regex, which is
+    # much cheaper than raising ValueError on every non-numeric token
+    if _NUMBER_RE.match(s):
+        return True
     try:
-        complex(s) # for int, long, float and complex
+        complex(s) # for complex, inf, nan, and other exotic forms
     except ValueError:
         return False
     return True
 
 def editFASTfile(FASTfile, replacedict):
-    commentchars = ['=', '#']
     OutListCount = 0
-    for line in fileinput.input(FASTfile, inplace=True, backup='.bak'):
-        #sys.stdout.write("# "+line)
-        linesplit=re.split('[, ;]+', line.strip())
+    # Read the file once, transform the lines in memory, write once at the
+    # end (much less I/O overhead than editing in place line-by-line)
+    with open(FASTfile) as fp:
+        alllines = fp.readlines()
+    shutil.copy(FASTfile, FASTfile+'.bak')
+    out = []
+    for line in alllines:
+        stripline=line.strip()
+        linesplit=_SPLIT_RE.split(stripline)
         outline=""
         # Check to make sure the line doesn't start with comment char
         firstchar = ""
-        if len(line.strip())>0: firstchar = line.strip()[0]
-        if firstchar in commentchars: 
+        if len(stripline)>0: firstchar = stripline[0]
+        if firstchar in _COMMENT_FIRSTCHAR:
             outline=str(line)
         # Edit the Outlist if applicable
         if (linesplit[0]=='OutList'):
-            if ('OutList' in replacedict.keys()) or ('OutList'+repr(OutListCount) in replacedict.keys()):
-                targetkey = 'OutList' if 'OutList' in replacedict.keys() else 'OutList'+repr(OutListCount)
+            if ('OutList' in replacedict) or ('OutList'+repr(OutListCount) in replacedict):
+                targetkey = 'OutList' if 'OutList' in replacedict else 'OutList'+repr(OutListCount)
                 sys.stderr.write('Adding %s to OutList\n'%(repr(replacedict[targetkey])))
                 outline = str(line)
                 outline += replacedict[targetkey]+'\n'
@@ -48,9 +71,11 @@ def editFASTfile(FASTfile, replacedict):
             if len(linesplit)<2:
                 outline=str(line)
             
-        # Check to make sure line is not all numbers
-        allnums = [is_number(x) for x in linesplit]
-        if False not in allnums:
+        # Check to make sure line is not all numbers (short-circuits on
+        # the first non-numeric token)
+        firstnonnum = next((i for i,x in enumerate(linesplit)
+                            if not is_number(x)), -1)
+        if firstnonnum<0:
             outline=str(line)
 
         # Handle list of nodes
@@ -58,10 +83,10 @@ def editFASTfile(FASTfile, replacedict):
             idx = 1
             if is_number(linesplit[idx]):
                 # Find the right keyword
-                idx = allnums.index(False)
+                idx = firstnonnum
 
             keyword = linesplit[idx]
-            if keyword in replacedict.keys():
+            if keyword in replacedict:
                 replacestring = repr(replacedict[keyword]).replace("'",'')
                 outline  = '%10s '%replacestring 
                 outline += ' '.join(linesplit[idx:])
@@ -71,116 +96,150 @@ def editFASTfile(FASTfile, replacedict):
                 outline=line
 
         # Write out the line
-        sys.stdout.write(outline)
+        out.append(outline)
+    with open(FASTfile, 'w') as fp:
+        fp.write("".join(out))
+    # Drop any cached parse of this file, since it just changed
+    _fastdictcache.pop(os.path.abspath(FASTfile), None)
     return
 
 def editDISCONfile(DISCONfile, replacedict):
     """
     Edits a value in the DISCON file
     """
-    findsubstring = lambda s, start, end: s.split(start)[1].split(end)[0]
-    commentchars = ['!']
+    keystart = '!'
     iline = 0
-    for line in fileinput.input(DISCONfile, inplace=True, backup='.bak'):
+    with open(DISCONfile) as fp:
+        alllines = fp.readlines()
+    shutil.copy(DISCONfile, DISCONfile+'.bak')
+    out = []
+    for line in alllines:
         outline=""
         # Ignore the line if it starts with a comment
-        if len(line.strip())>0: firstchar = line.strip()[0]
-        if firstchar in commentchars: 
+        if line.strip().startswith(keystart):
             outline=str(line)
-        
+
         # Replace the line by number
         linekey = 'line'+str(iline)
-        if linekey in replacedict.keys():
+        if linekey in replacedict:
             outline = replacedict[linekey]+'\n'
             sys.stderr.write('replacing line %i with \n%s'%(iline, outline))
-            
-        # Look for a keyword in the discon file
-        keystart = '!'
-        keyend   = '-'
-        try:
-            keyword = findsubstring(line, keystart, keyend).strip()
-        except:
-            keyword = None
-        if (keyword is not None) and keyword in replacedict.keys():
+
+        # Look for a keyword in the discon file (the token between the
+        # first '!' and the following '-')
+        keymatch = _DISCON_KEY_RE.search(line)
+        if keymatch and keymatch.group(1).strip() in replacedict:
+            keyword = keymatch.group(1).strip()
             # Replace everything in the beginning of the line
-            linesplit = line.split(keystart, 1)
-            endline = linesplit[1].strip()
-            outline = str(replacedict[keyword])+' ! '+endline+' [EDITED]\n'
-            sys.stderr.write(outline)            
+            comment = line[keymatch.start()+1:].strip()
+            outline = str(replacedict[keyword])+' ! '+comment+' [EDITED]\n'
+            sys.stderr.write(outline)
             
         # If nothing needs to be modified in the line, keep it original
         if outline=="":
             outline=line
         # Write out the line
-        sys.stdout.write(outline)
+        out.append(outline)
         iline += 1
+    with open(DISCONfile, 'w') as fp:
+        fp.write("".join(out))
     return
 
+def getVarFromDISCON(DISCONfile, key):
+    """
+    Gets the value of key in the DISCON file
+    """
+    # Stream through the file and stop at the first matching keyword
+    with open(DISCONfile) as fp:
+        for line in fp:
+            keymatch = _DISCON_KEY_RE.search(line)
+            if keymatch and keymatch.group(1).strip() == key:
+                return line[:keymatch.start()].strip()
+    return None
+
 def FASTfile2dict(FASTfile):
     """
     Reads the file FASTfile and returns a dictionary with parameters
     """
-    commentchars = ['=', '#']
     d = OrderedDict()
-    # go through the file line-by-line
+    # Read the entire file once and iterate over the lines in memory
     with open(FASTfile) as fp:
-        line=fp.readline()
-        while line:
-            # Check to make sure the line doesn't start with comment char
-            firstchar = ""
-            if len(line.strip())>0: firstchar = line.strip()[0]
-            if firstchar in commentchars: 
-                line=fp.readline()
-                continue
-            #linesplit=line.strip().split(", ")
-            linesplitX=re.split('[, ;]+', line.strip())
-            # Remove any empty tokens in linesplit
-            linesplit=[x.strip() for x in linesplitX if x.strip() != '']
+        alllines = fp.readlines()
+    nlines = len(alllines)
+    iline  = 0
+    # Bind the hot lookups to locals for the parsing loop
+    splitline = _SPLIT_RE.split
+    isnum     = is_number
+    while iline < nlines:
+        line   = alllines[iline].strip()
+        iline += 1
+        # Check to make sure the line doesn't start with comment char
+        firstchar = ""
+        if len(line)>0: firstchar = line[0]
+        if firstchar in _COMMENT_FIRSTCHAR:
+            continue
+        #linesplit=line.split(", ")
+        linesplitX=splitline(line)
+        # Remove any empty tokens in linesplit (one strip per token)
+        linesplit=[y for y in (x.strip() for x in linesplitX) if y != '']
 
-            # Ignore any lines with less than two items
-            if len(linesplit)<2:
-                line=fp.readline()
-                continue          
+        # Ignore any lines with less than two items
+        if len(linesplit)<2:
+            continue
+
+        # Check to make sure line is not all numbers (short-circuits on
+        # the first non-numeric token)
+        firstnonnum = next((i for i,x in enumerate(linesplit)
+                            if not isnum(x)), -1)
+        if firstnonnum<0:
+            continue
 
-            # Check to make sure line is not all numbers
-            allnums = [is_number(x) for x in linesplit]
-            if False not in allnums:
-                line=fp.readline()
-                continue          
-                
-            # Handle the outlist
-            if linesplit[0]=="OutList":
-                outlistline = fp.readline()
+        # Handle the outlist
+        if linesplit[0]=="OutList":
+            outlist = []
+            while iline < nlines:
+                outlistline = alllines[iline]
+                iline += 1
                 outlistlinesplit = outlistline.strip().split()
-                firstword   = "" if len(outlistlinesplit)==0 else outlistlinesplit[0]
-                outlist     = []
-                while firstword != "END":
-                    outlist.append(outlistline.strip())
-                    outlistline = fp.readline()
-                    outlistlinesplit = outlistline.strip().split()
-                    firstword   = "" if len(outlistlinesplit)==0 else outlistlinesplit[0]
+                firstword = "" if len(outlistlinesplit)==0 else outlistlinesplit[0]
+                if firstword == "END": break
+                outlist.append(outlistline.strip())
 
-                # Check how many other Outlists there are:
-                keylist = [k for k,g in d.items()]
-                numOutList=len([x for x in keylist if x.startswith('OutList')])
-                suffix = repr(numOutList) if numOutList>0 else ''
-                d["OutList"+suffix] = outlist
-                line = fp.readline()
-                continue
+            # Check how many other Outlists there are:
+            keylist = [k for k,g in d.items()]
+            numOutList=len([x for x in keylist if x.startswith('OutList')])
+            suffix = repr(numOutList) if numOutList>0 else ''
+            d["OutList"+suffix] = outlist
+            continue
 
-            # Handle list of nodes
-            idx = 1
-            if is_number(linesplit[idx]):
-                # Find the right keyword
-                idx = allnums.index(False)
+        # Handle list of nodes
+        idx = 1
+        if isnum(linesplit[idx]):
+            # Find the right keyword
+            idx = firstnonnum
 
-            keyword = linesplit[idx]
-            if idx==1:
-                d[keyword] = linesplit[0]
-            else:
-                d[keyword] = linesplit[:idx]
+        keyword = linesplit[idx]
+        if idx==1:
+            d[keyword] = linesplit[0]
+        else:
+            d[keyword] = linesplit[:idx]
+    return d
 
-            line=fp.readline()
+# Cache of parsed FAST files: abspath -> (mtime, dict)
+_fastdictcache = {}
+
+def cachedFASTfile2dict(FASTfile):
+    """
+    Same as FASTfile2dict, but caches the parsed dictionary so repeated
+    lookups on the same (unmodified) file don't re-read it
+    """
+    absfile = os.path.abspath(FASTfile)
+    mtime   = os.path.getmtime(absfile)
+    cached  = _fastdictcache.get(absfile)
+    if (cached is not None) and (cached[0] == mtime):
+        return cached[1]
+    d = FASTfile2dict(FASTfile)
+    _fastdictcache[absfile] = (mtime, d)
     return d
 
 def getFileFromFST(fstfile, key, fstdict=None):
@@ -188,7 +247,7 @@ def getFileFromFST(fstfile, key, fstdict=None):
     Get the file referenced by key in fstfile
     """
     if fstdict is None:
-        fstdict=FASTfile2dict(fstfile)
+        fstdict=cachedFASTfile2dict(fstfile)
     keyfile = fstdict[key].strip('"').strip("'")
     # Now set up the path to keyfile correctly
     fstpath = os.path.dirname(os.path.abspath(fstfile))
@@ -199,27 +258,22 @@ def getVarFromFST(fstfile, key, fstdict=None):
     Get the file referenced by key in fstfile
     """
     if fstdict is None:
-        fstdict=FASTfile2dict(fstfile)
+        fstdict=cachedFASTfile2dict(fstfile)
     return fstdict[key]
 
 def loadoutfile(filename):
     """
     Loads the FAST output file
     """
-    # load the data file  
-    dat=np.loadtxt(filename, skiprows=8)
-    # get the headers and units
+    # load the data file (pandas' C tokenizer is much faster than
+    # np.loadtxt on large output files)
+    dat=pd.read_csv(filename, skiprows=8, sep=r'\s+', header=None,
+                    dtype=np.float64).to_numpy()
+    # get the headers and units (lines 7 and 8 of the header block)
     with open(filename) as fp:
-        fp.readline() # blank  
-        fp.readline() # When FAST was run
-        fp.readline() # linked with...   
-        fp.readline() # blank            
-        fp.readline() # Description of FAST input file
-        fp.readline() # blank                         
-        varsline=fp.readline()
-        unitline=fp.readline()
-        headers=varsline.strip().split()
-        units  =unitline.strip().split()
+        headerlines = list(islice(fp, 8))
+    headers=headerlines[6].strip().split()
+    units  =headerlines[7].strip().split()
     return dat, headers, units
 
 def loadalldata(allfiles):
@@ -230,10 +284,13 @@ def loadalldata(allfiles):
     header0=[]
     units0=[]
     names=[]
+    # Load the files in parallel (I/O bound), keeping the input order
+    with ThreadPoolExecutor() as pool:
+        alldata = list(pool.map(loadoutfile, allfiles))
     for ifile, file in enumerate(allfiles):
         names.append(file)
         print("Loading file "+file)
-        dat, headers, units = loadoutfile(file)
+        dat, headers, units = alldata[ifile]
         adat.append(dat)
         if ifile==0:
             header0 = headers
@@ -244,12 +301,29 @@ def loadalldata(allfiles):
                 sys.exit(1)
     return adat, header0, units0, names
 
+# Cache of version checks: abspath -> (mtime, (ver, match))
+_versioncache = {}
+
+def cachedfindversion(fstfile):
+    """
+    Same as findOFversion.findversion, but caches the result so repeated
+    density get/set calls don't re-run the version checks
+    """
+    absfile = os.path.abspath(fstfile)
+    mtime   = os.path.getmtime(absfile)
+    cached  = _versioncache.get(absfile)
+    if (cached is not None) and (cached[0] == mtime):
+        return cached[1]
+    vermatch = findOFversion.findversion(fstfile)
+    _versioncache[absfile] = (mtime, vermatch)
+    return vermatch
+
 def getDensity(fstfile, verbose=False):
     """
     Gets the density in OpenFAST input file
     """
     # Get the version of the fstfile
-    ver, match = findOFversion.findversion(fstfile)
+    ver, match = cachedfindversion(fstfile)
     if verbose: print("Version: "+repr(ver))
     if (match != findOFversion.versionmatch.MATCH):
         print("No matching version found for "+fstfile)
@@ -284,7 +358,7 @@ def setDensity(fstfile, density, verbose=False):
     Sets the density in OpenFAST input file
     """
     # Get the version of the fstfile
-    ver, match = findOFversion.findversion(fstfile)
+    ver, match = cachedfindversion(fstfile)
     if verbose: print("Version: "+repr(ver))
     if (match != findOFversion.versionmatch.MATCH):
         print("No matching version found for "+fstfile)
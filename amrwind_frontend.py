@@ -45,6 +45,7 @@ from matplotlib.patches     import Rectangle
 import matplotlib.pyplot    as plt
 from matplotlib.lines       import Line2D
 import argparse
+import io
 import subprocess
 import signal
 import copy
@@ -347,8 +348,9 @@ class MyApp(tkyg.App, object):
         # Get the help dict
         helpdict = self.getHelpFromInputs('AMR-Wind', 'help')
 
-        # Convert the dictionary to string output
-        returnstr = ''
+        # Convert the dictionary to string output (accumulate in a
+        # StringIO buffer rather than repeated string concatenation)
+        returnbuf = io.StringIO()
         if len(filename)>0:  f=open(filename, "w")
         for key, val in outputdict.items():
             outputkey = key
@@ -360,7 +362,7 @@ class MyApp(tkyg.App, object):
                     writestr = val.decode('string_escape')
                 if verbose: print(writestr)
                 if len(filename)>0: f.write(writestr+"\n")
-                returnstr += writestr+"\n"
+                returnbuf.write(writestr+"\n")
                 continue
             elif (key[0] == '#'):
                 continue
@@ -378,12 +380,12 @@ class MyApp(tkyg.App, object):
                     writestr += "# "+helpdict[outputkey]
                 if verbose: print(writestr)
                 if len(filename)>0: f.write(writestr+"\n")
-                returnstr += writestr+"\n"
+                returnbuf.write(writestr+"\n")
         if len(filename)>0:     
             f.close()
             self.savefile = filename
         
-        return returnstr
+        return returnbuf.getvalue()
 
     def writeAMRWindInputGUI(self):
         filename  = filedialog.asksaveasfilename(initialdir = "./",
@@ -994,9 +996,9 @@ class MyApp(tkyg.App, object):
         # Load validateinputs plugins
         num_nonactive = 0
         num_active    = 0
-        outputstr     = ""
-        def printcat(x): print(x); return x+"\n"
-        outputstr += printcat("-- Checking inputs --")
+        outputbuf     = io.StringIO()
+        def printcat(x): print(x); outputbuf.write(x+"\n")
+        printcat("-- Checking inputs --")
         resultclass = OrderedDict()
         for c in validateinputs.CheckStatus: resultclass[c.name] = []
         for p in validateinputs.pluginlist:
@@ -1007,17 +1009,16 @@ class MyApp(tkyg.App, object):
                 for r in results:
                     resultclass[r['result'].name].append(r)
                     if printeverything:
-                        outputstr += \
-                            printcat("[%5s] %-20s %s"%(r['result'].name,
-                                                       p.name+":"+r['subname'],
-                                                       r['mesg']))
+                        printcat("[%5s] %-20s %s"%(r['result'].name,
+                                                   p.name+":"+r['subname'],
+                                                   r['mesg']))
             else:
                 num_nonactive = num_nonactive+1            
-        outputstr += printcat('')
-        outputstr += printcat("Results: ")
+        printcat('')
+        printcat("Results: ")
         for k, g in resultclass.items():
-            outputstr += printcat(' %i %s'%(len(g), k))
-        return outputstr
+            printcat(' %i %s'%(len(g), k))
+        return outputbuf.getvalue()
     
     def setupfigax(self, clear=True, subplot=111):
         # Clear and resize figure
@@ -1468,7 +1469,10 @@ class MyApp(tkyg.App, object):
 
         if len(plotvars)<1: return returndict
         for var in plotvars:
-            prof=postpro.CalculatedProfile.fromdict(postpro.statsprofiles[var],
+            # Pull the profile definition out once per variable
+            vardict = postpro.statsprofiles[var]
+            varheader = vardict['header']
+            prof=postpro.CalculatedProfile.fromdict(vardict,
                                                     self.abl_stats,
                                                     self.abl_profiledata, avgt,
                                                     usemapped=usemapped)
@@ -1477,15 +1481,15 @@ class MyApp(tkyg.App, object):
             N = np.shape(plotdat)
             if len(N)>1:
                 # Break the header labels
-                varlabels = postpro.statsprofiles[var]['header'].split()
+                varlabels = varheader.split()
                 for i in range(N[1]):
                     if doplot: 
                         ax.plot(plotdat[:,i], z, label=var+': '+varlabels[i])
                     returndict[varlabels[i]] = {'z':z, 'data':plotdat[:,i]}
             else:
                 if doplot:
-                    ax.plot(plotdat, z, label=postpro.statsprofiles[var]['header'])
-                returndict[postpro.statsprofiles[var]['header']] = {'z':z, 'data':plotdat}
+                    ax.plot(plotdat, z, label=varheader)
+                returndict[varheader] = {'z':z, 'data':plotdat}
         if doplot:
             # Format the plot
             ax.set_ylabel('z [m]')
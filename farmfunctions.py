@@ -11,6 +11,7 @@ Wind farm functions
 import numpy as np
 import pandas as pd
 import sys, os, csv
+import json
 import re
 import shlex
 from collections            import OrderedDict 
@@ -706,6 +707,13 @@ def turbines_createAllTurbines(self):
         AMRoptions = extractkeystartingwith(turb['options'], 'AMRparam_', removeprefix=True)
 
         def tryeval(s) :
+            # For strings that look like numbers, lists, or dicts, try
+            # the JSON parser first: it is much faster than eval
+            if isinstance(s, str) and s[:1] in '0123456789-[{"':
+                try:
+                    return json.loads(s)
+                except ValueError:
+                    pass
             try:
                 x = eval(s)
             except:
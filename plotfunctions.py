@@ -89,11 +89,15 @@ def getCirclePts(inputorigin, inputnormal, R, Npts=10):
     theta = 2.0*np.pi/Npts
     #ds    = 2.0*R*np.sin(theta/2)
     ds    = R*np.tan(theta)
+    n0, n1, n2 = normal
     ptlist = [origin+rhat*R]
     for i in range(Npts):
         rhat  = ptlist[-1]-origin
         rhat  = rhat/np.linalg.norm(rhat)
-        thhat = np.cross(rhat, normal)
+        # Inline rhat x normal (np.cross has too much overhead for 3-vectors)
+        thhat = np.array([rhat[1]*n2 - rhat[2]*n1,
+                          rhat[2]*n0 - rhat[0]*n2,
+                          rhat[0]*n1 - rhat[1]*n0])
         newpt = ptlist[-1]+ds*thhat
         newrhat = newpt - origin
         newrhat = newrhat/np.linalg.norm(newrhat)
@@ -136,9 +140,12 @@ def rotatepoint(pt, orig, theta):
     """
     dx = pt[0]-orig[0]
     dy = pt[1]-orig[1]
+    # Evaluate the trig functions once instead of twice each
+    costheta = np.cos(theta)
+    sintheta = np.sin(theta)
     p2=[0.0, 0.0, 0.0]
-    p2[0] = dx*np.cos(theta) - dy*np.sin(theta) + orig[0]
-    p2[1] = dx*np.sin(theta) + dy*np.cos(theta) + orig[1]
+    p2[0] = dx*costheta - dy*sintheta + orig[0]
+    p2[1] = dx*sintheta + dy*costheta + orig[1]
     p2[2] = pt[2]
     return p2
 
@@ -268,11 +275,7 @@ def plotDomain(self, ax=None, verbose=False, plotskip=1):
                 end   = np.array(allpdict[p+'.end'])
 
                 dx    = (end-start)/(Npts-1.0)
-                pts   = []
-                for i in range(Npts):
-                    pt = start + dx*i
-                    pts.append(pt)
-                pts = np.array(pts)
+                pts   = start + np.outer(np.arange(Npts), dx)
                 ax.plot(pts[::plotskip,ix], pts[::plotskip,iy], label=p, **splotdict)
             if allpdict[p+'.type'][0]=='PlaneSampler':
                 Npts   = allpdict[p+'.num_points']
@@ -296,15 +299,12 @@ def plotDomain(self, ax=None, verbose=False, plotskip=1):
                     for dx in offsets:
                         offsetvec.append(offsetnormal*dx)
 
-                pts    = []
-
-                # Construct the list of all plane points
-                for doffset in offsetvec:
-                    for i in range(Npts[0]):
-                        for j in range(Npts[1]):
-                            pt = origin + i*dx1 + j*dx2 + doffset
-                            pts.append(pt)
-                pts = np.array(pts)
+                # Construct all of the plane points by broadcasting
+                # origin + i*dx1 + j*dx2 + offset over (offset, i, j)
+                ivec   = np.arange(Npts[0]).reshape((1, Npts[0], 1, 1))
+                jvec   = np.arange(Npts[1]).reshape((1, 1, Npts[1], 1))
+                offarr = np.array(offsetvec).reshape((len(offsetvec), 1, 1, 3))
+                pts    = (origin + ivec*dx1 + jvec*dx2 + offarr).reshape((-1, 3))
                 ax.plot(pts[::plotskip,ix], pts[::plotskip,iy], label=p, **splotdict)
             if allpdict[p+'.type'][0]=='LidarSampler':
                 # Get the inputs
@@ -328,23 +328,19 @@ def plotDomain(self, ax=None, verbose=False, plotskip=1):
 
                 dx = length/float(Npts-1)
 
-                pts    = []
-                # Construct a list of all lidar points
-                for t in timevec:
-                    current_azi = deg2rad(np.interp(t, time_table, azi_table))
-                    current_ele = deg2rad(90.0 - np.interp(t, time_table, ele_table))
-                    for i in range(Npts):
-                        lidar_pt_0 = (origin[0] + i*dx*
-                                      np.cos(current_azi)*np.sin(current_ele))
-                        lidar_pt_1 = (origin[1] + i*dx*
-                                      np.sin(current_azi)*np.sin(current_ele))
-                        lidar_pt_2 = (origin[2] + i*dx*np.cos(current_ele))
-                        lidar_pt = np.array([lidar_pt_0,
-                                             lidar_pt_1,
-                                             lidar_pt_2])
-                        pts.append(lidar_pt)
-
-                pts = np.array(pts)
+                # Interpolate the angle tables for all times at once
+                azivec = deg2rad(np.interp(timevec, time_table, azi_table))
+                elevec = deg2rad(90.0 - np.interp(timevec, time_table,
+                                                  ele_table))
+                # Construct all lidar points in one array: a unit beam
+                # direction per time, outer product with beam distances
+                sinele = np.sin(elevec)
+                dirs = np.column_stack((np.cos(azivec)*sinele,
+                                        np.sin(azivec)*sinele,
+                                        np.cos(elevec)))
+                dist = np.arange(Npts)*dx
+                pts  = (origin + dist[np.newaxis,:,np.newaxis]
+                        *dirs[:,np.newaxis,:]).reshape((-1, 3))
                 ax.plot(pts[::plotskip,ix], pts[::plotskip,iy], label=p, **splotdict)
 
 
@@ -414,7 +414,7 @@ def printReport(ncdat, heights, avgt, span,verbose=True):
         prof=CalculatedProfile.fromdict(statsprofiles[var],ncdat, alldata, avgt,span)
         z, qdat = prof.calculate()
         interpf = interpolate.interp1d(z, qdat)
-        reportvars[var]=[interpf(z) for z in heights]
+        reportvars[var]=interpf(heights)
 
     if verbose:
         # Print the header
@@ -51,13 +51,9 @@ def getVar(ncdat, var, group=None):
 
 def getPlotAxis(xyz, plotaxis):
     if plotaxis.upper()=='S':
-        # Calculate the plot axis
-        saxis = [0]
-        Npts = len(xyz[:,0])
-        for i in range(Npts-1):
-            dist=np.linalg.norm(xyz[i,:]-xyz[i+1,:]) + saxis[-1]
-            saxis.append(dist)
-        return saxis
+        # Calculate the plot axis with one vectorized cumulative sum
+        dists = np.linalg.norm(np.diff(xyz, axis=0), axis=1)
+        return np.concatenate(([0.0], np.cumsum(dists)))
     if plotaxis.upper()=='X':
         return xyz[:,0]
     if plotaxis.upper()=='Y':
@@ -73,11 +69,8 @@ def getLineSampleAtTime(ncdat, group, varlist, it):
 
     linedat = {}
     for var in varlist:
-        ncvar  = nc.variables[var]
-        vardat = np.zeros(Npts)
-        for i in range(Npts):
-            vardat[i] = ncvar[it, i]
-        linedat[var] = vardat
+        # Read the whole line in one slice instead of one point at a time
+        linedat[var] = np.asarray(nc.variables[var][it, :Npts])
     return xyz, linedat
 
 def getPlaneSampleAtTime(ncdat, group, var, itime, kplane):
@@ -89,31 +82,18 @@ def getPlaneSampleAtTime(ncdat, group, var, itime, kplane):
 
     N1      = Nijk[0]
     N2      = Nijk[1]
-    xmesh   = np.zeros((N1,N2))
-    ymesh   = np.zeros((N1,N2))
-    zmesh   = np.zeros((N1,N2))
-    vmesh   = np.zeros((N1,N2))
+    # Pull the whole plane out in one read: point ipt = i + j*N1 + offset,
+    # so the flat plane reshapes to (N2,N1) and transposes to (N1,N2)
+    offset  = kplane*N1*N2
+    pts     = np.asarray(allpts[offset:offset+N1*N2, :])
+    xmesh   = pts[:,0].reshape((N2,N1)).transpose()
+    ymesh   = pts[:,1].reshape((N2,N1)).transpose()
+    zmesh   = pts[:,2].reshape((N2,N1)).transpose()
+    vmesh   = np.asarray(vardat[itime, offset:offset+N1*N2]).reshape((N2,N1)).transpose()
 
     # Set up the s directions
     ds1     = np.linalg.norm(axis1)/(N1-1)
     ds2     = np.linalg.norm(axis2)/(N2-1)
-    s1mesh  = np.zeros((N1,N2))
-    s2mesh  = np.zeros((N1,N2))
-
-    for i in range(N1):
-        for j in range(N2):
-            ipt = i + j*N1 + kplane*N1*N2
-            x   = allpts[ipt,0]
-            y   = allpts[ipt,1]
-            z   = allpts[ipt,2]
-            v   = vardat[itime, ipt]
-            xmesh[i,j] = x
-            ymesh[i,j] = y
-            zmesh[i,j] = z
-            vmesh[i,j] = v
-
-            s1  = i*ds1
-            s2  = j*ds2
-            s1mesh[i,j] = s1
-            s2mesh[i,j] = s2
+    s1mesh, s2mesh = np.meshgrid(np.arange(N1)*ds1, np.arange(N2)*ds2,
+                                 indexing='ij')
     return xmesh, ymesh, zmesh, s1mesh, s2mesh, vmesh
@@ -17,37 +17,42 @@ def getPlaneXR(ncfile, itimevec, varnames, groupname=None,
     for v in varnames: db[v] = {}
     db['timesteps'] = []
     timevec = None
+    # Open the file once and reuse the handle for times and groups
+    ncdat = None
+    if gettimes or (groupname is None):
+        ncdat = ppsample.loadDataset(ncfile)
     if gettimes:
-        timevec = ppsample.getVar(ppsample.loadDataset(ncfile), 'time')
+        timevec = ppsample.getVar(ncdat, 'time')
         db['times'] = []
     # Now load the ncfile data
     if groupname is None:
-        groups= ppsample.getGroups(ppsample.loadDataset(ncfile))
+        groups= ppsample.getGroups(ncdat)
         group = groups[0]
     else:
         group = groupname
     with xr.open_dataset(ncfile, group=group) as ds:
         reshapeijk = ds.attrs['ijk_dims'][::-1]
-        xm = ds['coordinates'].data[:,0].reshape(tuple(reshapeijk))
-        ym = ds['coordinates'].data[:,1].reshape(tuple(reshapeijk))
-        zm = ds['coordinates'].data[:,2].reshape(tuple(reshapeijk))
-        dtime=xr.open_dataset(ncfile)
-        dtime.close()
+        # Read the coordinates array once and slice the columns
+        allpts = ds['coordinates'].data
+        xm = allpts[:,0].reshape(tuple(reshapeijk))
+        ym = allpts[:,1].reshape(tuple(reshapeijk))
+        zm = allpts[:,2].reshape(tuple(reshapeijk))
         db['x'] = xm
         db['y'] = ym
-        db['z'] = zm        
+        db['z'] = zm
         for itime in itimevec:
             if verbose>0:
                 print("extracting iter "+repr(itime))
             db['timesteps'].append(itime)
             if gettimes:
                 db['times'].append(float(timevec[itime]))
-            for v in varnames:
-                vvar = extractvar(ds, v, itime)
-                db[v][itime] = vvar
-            #vx = extractvar(ds, vxvar, itime)
-            #vy = extractvar(ds, vyvar, itime)
-            #vz = extractvar(ds, vzvar, itime)
+        for v in varnames:
+            # Read all requested timesteps in one slab per variable,
+            # rather than one xarray indexing call per (time, variable).
+            # Index before .data so only the requested rows are loaded
+            vdat = ds[v][itimevec, :].data
+            for ind, itime in enumerate(itimevec):
+                db[v][itime] = vdat[ind, :].reshape(tuple(reshapeijk))
         if includeattr:
             for k, g in ds.attrs.items():
                 db[k] = g
@@ -79,26 +84,27 @@ def getPlanePtsXR(ncfile, itimevec, ptlist,
         for v in varnames:
             db[pt][v] = []
     db['timesteps'] = []
-    Ntimes = len(ppsample.getVar(ppsample.loadDataset(ncfile), 'time'))
-    timevec = None
+    # Open the file once and reuse the handle for times and groups
+    ncdat   = ppsample.loadDataset(ncfile)
+    timevec = ppsample.getVar(ncdat, 'time')
+    Ntimes  = len(timevec)
     if gettimes:
-        timevec = ppsample.getVar(ppsample.loadDataset(ncfile), 'time')
         db['times'] = []
     if len(itimevec)==0:
         itimevec = list(range(Ntimes))
     # Now load the ncfile data
     if groupname is None:
-        groups= ppsample.getGroups(ppsample.loadDataset(ncfile))
+        groups= ppsample.getGroups(ncdat)
         group = groups[0]
     else:
         group = groupname
     with xr.open_dataset(ncfile, group=group) as ds:
         reshapeijk = ds.attrs['ijk_dims'][::-1]
-        xm = ds['coordinates'].data[:,0].reshape(tuple(reshapeijk))
-        ym = ds['coordinates'].data[:,1].reshape(tuple(reshapeijk))
-        zm = ds['coordinates'].data[:,2].reshape(tuple(reshapeijk))
-        dtime=xr.open_dataset(ncfile)
-        dtime.close()
+        # Read the coordinates array once and slice the columns
+        allpts = ds['coordinates'].data
+        xm = allpts[:,0].reshape(tuple(reshapeijk))
+        ym = allpts[:,1].reshape(tuple(reshapeijk))
+        zm = allpts[:,2].reshape(tuple(reshapeijk))
         db['x'] = xm
         db['y'] = ym
         db['z'] = zm
@@ -132,32 +138,37 @@ def avgPlaneXR_OLD(ncfile, timerange,
     #for v in varnames: db[v] = {}
     t1 = timerange[0]
     t2 = timerange[1]
-    timevec = ppsample.getVar(ppsample.loadDataset(ncfile), 'time')
-    filtertime=np.where((t1 <= np.array(timevec)) & (np.array(timevec) <= t2))
+    # Open the file once and reuse the handle for times and groups
+    ncdat = ppsample.loadDataset(ncfile)
+    timevec = ppsample.getVar(ncdat, 'time')
+    tarr = np.asarray(timevec)
+    filtertime=np.where((t1 <= tarr) & (tarr <= t2))
     Ntotal=len(filtertime[0])
     db['times'] = []
     # Now load the ncfile data
     if groupname is None:
-        groups= ppsample.getGroups(ppsample.loadDataset(ncfile))
+        groups= ppsample.getGroups(ncdat)
         group = groups[0]
     else:
         group = groupname
     db['group'] = group
     with xr.open_dataset(ncfile, group=group) as ds:
         reshapeijk = ds.attrs['ijk_dims'][::-1]
-        xm = ds['coordinates'].data[:,0].reshape(tuple(reshapeijk))
-        ym = ds['coordinates'].data[:,1].reshape(tuple(reshapeijk))
-        zm = ds['coordinates'].data[:,2].reshape(tuple(reshapeijk))
+        # Read the coordinates array once and slice the columns
+        allpts = ds['coordinates'].data
+        xm = allpts[:,0].reshape(tuple(reshapeijk))
+        ym = allpts[:,1].reshape(tuple(reshapeijk))
+        zm = allpts[:,2].reshape(tuple(reshapeijk))
         db['x'] = xm
         db['y'] = ym
         db['z'] = zm
         # Set up the initial mean fields
         zeroarray = extractvar(ds, varnames[0], 0)
         for v in varnames:
-            db[v+suf] = np.full_like(zeroarray, 0.0)
+            db[v+suf] = np.zeros_like(zeroarray)
         if len(extrafuncs)>0:
             for f in extrafuncs:
-                db[f['name']+suf] = np.full_like(zeroarray, 0.0)
+                db[f['name']+suf] = np.zeros_like(zeroarray)
         Ncount = 0
         # Loop through and accumulate
         for itime, t in enumerate(timevec):
@@ -226,7 +237,8 @@ def avgPlaneXR(ncfileinput, timerange,
     Ncount = 0
     for ncfile in ncfilelist:
         timevec     = ppsample.getVar(ppsample.loadDataset(ncfile), 'time')
-        filtertime  = np.where((t1 <= np.array(timevec)) & (np.array(timevec) <= t2))
+        tarr        = np.asarray(timevec)
+        filtertime  = np.where((t1 <= tarr) & (tarr <= t2))
         Ntotal      = len(filtertime[0])
         if verbose:
             print("%s %i"%(ncfile, Ntotal))
@@ -235,9 +247,11 @@ def avgPlaneXR(ncfileinput, timerange,
         with xr.open_dataset(ncfile, group=group) as ds:
             if 'x' not in ds:
                 reshapeijk = ds.attrs['ijk_dims'][::-1]
-                xm = ds['coordinates'].data[:,0].reshape(tuple(reshapeijk))
-                ym = ds['coordinates'].data[:,1].reshape(tuple(reshapeijk))
-                zm = ds['coordinates'].data[:,2].reshape(tuple(reshapeijk))
+                # Read the coordinates array once and slice the columns
+                allpts = ds['coordinates'].data
+                xm = allpts[:,0].reshape(tuple(reshapeijk))
+                ym = allpts[:,1].reshape(tuple(reshapeijk))
+                zm = allpts[:,2].reshape(tuple(reshapeijk))
                 db['x'] = xm
                 db['y'] = ym
                 db['z'] = zm
@@ -245,11 +259,11 @@ def avgPlaneXR(ncfileinput, timerange,
             zeroarray = extractvar(ds, varnames[0], 0)
             for v in varnames:
                 if v+suf not in db:
-                    db[v+suf] = np.full_like(zeroarray, 0.0)
+                    db[v+suf] = np.zeros_like(zeroarray)
             if len(extrafuncs)>0:
                 for f in extrafuncs:
                     if f['name']+suf not in db:
-                        db[f['name']+suf] = np.full_like(zeroarray, 0.0)
+                        db[f['name']+suf] = np.zeros_like(zeroarray)
             # Loop through and accumulate
             for itime, t in enumerate(timevec):
                 if (t1 < t) and (t <= t2):
@@ -321,13 +335,13 @@ def MinMaxStd_PlaneXR(ncfile, timerange,
         zeroarray = extractvar(ds, varnames[0], 0)
         # Set up the initial mean fields
         for v in varnames:
-            db[v+sstd] =  np.full_like(zeroarray, 0.0)
+            db[v+sstd] =  np.zeros_like(zeroarray)
             db[v+smax] =  np.full_like(zeroarray, -bigval)
             db[v+smin] =  np.full_like(zeroarray, bigval)
         if len(extrafuncs)>0:
             for f in extrafuncs:
                 name = f['name']
-                db[name+sstd] = np.full_like(zeroarray, 0.0)
+                db[name+sstd] = np.zeros_like(zeroarray)
                 db[name+smax] = np.full_like(zeroarray, -bigval)
                 db[name+smin] = np.full_like(zeroarray, bigval)
         Ncount = 0
@@ -416,7 +430,7 @@ def ReynoldsStress_PlaneXR(ncfile, timerange,
         # Set up the initial mean fields
         for corr in corrlist:
             suff = corr[0]
-            db[suff] =  np.full_like(zeroarray, 0.0)
+            db[suff] =  np.zeros_like(zeroarray)
         Ncount = 0
         # Loop through and accumulate
         if verbose: print("Calculating reynolds-stress")
@@ -453,22 +467,26 @@ def getLineXR(ncfile, itimevec, varnames, groupname=None,
     for v in varnames: db[v] = {}
     db['timesteps'] = []
     timevec = None
+    # Open the file once and reuse the handle for times and groups
+    ncdat = None
+    if gettimes or (groupname is None):
+        ncdat = ppsample.loadDataset(ncfile)
     if gettimes:
-        timevec = ppsample.getVar(ppsample.loadDataset(ncfile), 'time')
+        timevec = ppsample.getVar(ncdat, 'time')
         db['times'] = []
     # Now load the ncfile data
     if groupname is None:
-        groups= ppsample.getGroups(ppsample.loadDataset(ncfile))
+        groups= ppsample.getGroups(ncdat)
         group = groups[0]
     else:
         group = groupname
     with xr.open_dataset(ncfile, group=group) as ds:
         #reshapeijk = ds.attrs['ijk_dims'][::-1]
-        xm = ds['coordinates'].data[:,0] #.reshape(tuple(reshapeijk))
-        ym = ds['coordinates'].data[:,1] #.reshape(tuple(reshapeijk))
-        zm = ds['coordinates'].data[:,2] #.reshape(tuple(reshapeijk))
-        dtime=xr.open_dataset(ncfile)
-        dtime.close()
+        # Read the coordinates array once and slice the columns
+        allpts = ds['coordinates'].data
+        xm = allpts[:,0] #.reshape(tuple(reshapeijk))
+        ym = allpts[:,1] #.reshape(tuple(reshapeijk))
+        zm = allpts[:,2] #.reshape(tuple(reshapeijk))
         db['x'] = xm
         db['y'] = ym
         db['z'] = zm
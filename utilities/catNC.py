@@ -26,6 +26,8 @@ def stitchtimes(filelist, timesubset=[]):
     filelist.
     """
     mastertimevec = []
+    # Set of times already seen, for O(1) duplicate checks
+    seentimes     = set()
     includetimes  = []
     # Index of which file and which iter this time comes from
     timeindex     = []
@@ -34,9 +36,10 @@ def stitchtimes(filelist, timesubset=[]):
        ncdat = Dataset(f, 'r')
        time  = np.array(ncdat.variables['time'])
        includelist = [False]*len(time)
-       for iter, t in enumerate(time): 
-           if addTime(t, mastertimevec, timesubset):
+       for iter, t in enumerate(time):
+           if addTime(t, seentimes, timesubset):
                mastertimevec.append(t)
+               seentimes.add(t)
                includelist[iter] = True
                timeindex.append([fi, iter, itime])
                itime += 1
@@ -44,6 +47,22 @@ def stitchtimes(filelist, timesubset=[]):
        ncdat.close()
     return mastertimevec, timeindex
 
+def contiguousruns(entries):
+    """
+    Group the [ifile, ilocal, iglobal] entries into runs where both the
+    source and destination time indices are consecutive, so each run
+    can be copied as one slab
+    """
+    runs = []
+    for entry in entries:
+        ilocal, iglobal = entry[1], entry[2]
+        if (len(runs)>0 and (ilocal  == runs[-1][0]+runs[-1][2])
+                        and (iglobal == runs[-1][1]+runs[-1][2])):
+            runs[-1][2] += 1
+        else:
+            runs.append([ilocal, iglobal, 1])
+    return runs
+
 def openNCfile(ncfilename, timevec, ndim=3):
     # Write the netcdf file with WRF forcing
     rootgrp = Dataset(ncfilename, "w", format="NETCDF4")
@@ -147,13 +166,11 @@ def addGroup(rootgrp, group, filelist, timeindexlist,
         for ifile, fname in enumerate(filelist):
             if len(filetimeindex[ifile]) == 0: 
                 continue
-            # Loop through all times in filetimeindex
+            # Copy contiguous runs of times as slabs
             src_ncdat = Dataset(fname, 'r')
             srcvar = src_ncdat[group].variables[v]
-            for entry in filetimeindex[ifile]:
-                ilocal  = entry[1]
-                iglobal = entry[2]
-                vdat[iglobal,:] = srcvar[ilocal,:]
+            for i0, j0, n in contiguousruns(filetimeindex[ifile]):
+                vdat[j0:j0+n,:] = srcvar[i0:i0+n,:]
             src_ncdat.close()
     return
 
@@ -163,16 +180,14 @@ def addVar_to_group(varname, groupname, dest_subgroup, dimlist,
     for ifile, fname in enumerate(filelist):
         if len(filetimeindex[ifile]) == 0: 
             continue
-        # Loop through all times in filetimeindex
+        # Copy contiguous runs of times as slabs
         src_ncdat = Dataset(fname, 'r')
         srcvar = src_ncdat[groupname].variables[varname]
-        for entry in filetimeindex[ifile]:
-            ilocal  = entry[1]
-            iglobal = entry[2]
+        for i0, j0, n in contiguousruns(filetimeindex[ifile]):
             if arraysize==2:
-                vdat[iglobal,:] = srcvar[ilocal,:]
+                vdat[j0:j0+n,:] = srcvar[i0:i0+n,:]
             elif arraysize==3:
-                vdat[iglobal,:,:] = srcvar[ilocal,:,:]
+                vdat[j0:j0+n,:,:] = srcvar[i0:i0+n,:,:]
         src_ncdat.close()
     return
 
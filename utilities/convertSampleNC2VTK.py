@@ -7,6 +7,7 @@
 #
 
 import sys
+import io
 import matplotlib.pyplot as plt
 import numpy as np
 from netCDF4 import Dataset
@@ -64,10 +65,11 @@ def convertplane2vtk(ncdat, timevec, savefile, group, kplanes=[],
     Ncells    = (Ni-1)*(Nj-1)
     Nvars     = len(extractvars)
 
-    # Get the list of time indexes
+    # Get the list of time indexes (one vectorized scan for all times)
+    allidx    = np.abs(np.asarray(t)[np.newaxis,:]
+                       - np.asarray(timevec)[:,np.newaxis]).argmin(axis=1)
     tindexvec = []
-    for time in timevec:
-        idx = (np.abs(t - time)).argmin()
+    for time, idx in zip(timevec, allidx):
         if np.abs(t[idx]-time)<eps:
             tindexvec.append(idx)
         else:
@@ -81,17 +83,18 @@ def convertplane2vtk(ncdat, timevec, savefile, group, kplanes=[],
 
     for k in kplanes:
         if verbose: print("Working on plane %i"%k)
-        # Get the xyz points
-        xyz    = []
-        allidx = []
-        for i in range(Ni):
-            for j in range(Nj):
-                if jfirst:
-                    ipt = j + i*Nj + k*Ni*Nj
-                else:
-                    ipt = i + j*Ni + k*Ni*Nj                    
-                allidx.append(ipt)
-                xyz.append([allpts[ipt,0], allpts[ipt,1], allpts[ipt,2]])
+        # Get the xyz points: read the whole plane in one netCDF call and
+        # reorder in memory, instead of one read per point
+        offset = k*Ni*Nj
+        if jfirst:
+            # j varies first in the file, which matches the output
+            # ordering: the reorder is the identity, so skip the gather
+            lidx = None
+        else:
+            ii, jj = np.meshgrid(np.arange(Ni), np.arange(Nj), indexing='ij')
+            lidx = (ii + jj*Ni).ravel()
+        planepts = np.asarray(allpts[offset:offset+Ni*Nj, :])
+        xyz      = planepts if lidx is None else planepts[lidx, :]
         if verbose: print("Extracted xyz")
 
         for titer, tindex in enumerate(tindexvec):
@@ -99,29 +102,34 @@ def convertplane2vtk(ncdat, timevec, savefile, group, kplanes=[],
             # Write the stuff
             filename=savefile.format(k=k,time=timevec[titer])
             if verbose: print("Writing "+filename)
-            f = open(filename,"w")
-            # Write the header and coordinates
-            f.write(vtkheader)
-            f.write("DIMENSIONS %i %i 1\n"%(Ni, Nj))
-            f.write("POINTS %i float\n"%(Npoints))
-            for row in xyz:
-                f.write("%e %e %e\n"%(row[0], row[1], row[2]))
-            f.write("CELL_DATA %i\n"%Ncells)
-            f.write("POINT_DATA %i\n"%Npoints)
-    
+            # Assemble the whole file in memory and write it to disk
+            # in a single call at the end
+            f = io.StringIO()
+            # Write the header and coordinates (assemble each block of
+            # header lines into one string so it goes out in one write)
+            f.write(vtkheader
+                    + "DIMENSIONS %i %i 1\n"%(Ni, Nj)
+                    + "POINTS %i float\n"%(Npoints))
+            np.savetxt(f, xyz, fmt='%e')
+
             # Write the variables
-            f.write("FIELD FieldData %i\n"%Nvars)
+            f.write("CELL_DATA %i\n"%Ncells
+                    + "POINT_DATA %i\n"%Npoints
+                    + "FIELD FieldData %i\n"%Nvars)
             for var in extractvars:
                 varcomp = len(var['vars'])
                 varname = var['name']
                 f.write("%s %i %i float\n"%(varname, varcomp, Npoints))
-                allvardat = np.zeros((varcomp, len(allidx)))
+                allvardat = np.zeros((varcomp, Ni*Nj))
                 for iv, v in enumerate(var['vars']):
                     vardat  = ncdat[group].variables[v]
-                    allvardat[iv, :] = vardat[tindex, allidx]
-                for i in range(len(allidx)):
-                    f.write(" ".join([repr(x) for x in allvardat[:, i] ]))
-                    f.write("\n")
+                    vslab   = np.asarray(vardat[tindex, offset:offset+Ni*Nj])
+                    allvardat[iv, :] = vslab if lidx is None else vslab[lidx]
+                # Assemble all rows and write them in one call
+                # (repr(float(x)) keeps the full-precision formatting)
+                f.write("\n".join(" ".join(repr(float(x)) for x in row)
+                                  for row in allvardat.transpose()))
+                f.write("\n")
             # for var in extractvars:
             #     varcomp = 1   # Number of components in variable
             #     f.write("%s %i %i float\n"%(var, varcomp, Npoints))
@@ -129,6 +137,8 @@ def convertplane2vtk(ncdat, timevec, savefile, group, kplanes=[],
             #     vardatt = vardat[tindex, allidx]
             #     for v in vardatt:
             #         f.write("%s\n"%repr(v))
+            with open(filename, "w") as outf:
+                outf.write(f.getvalue())
             f.close()
     return
 
@@ -9,6 +9,8 @@ basepath   = os.path.dirname(scriptpath)
 amrwindfedirs = ['../',
                  basepath]
 import sys, os, shutil
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
 for x in amrwindfedirs: sys.path.insert(1, x)
 
 import postproamrwindsample as ppsample
@@ -17,7 +19,6 @@ import postproamrwindsample_xarray as ppsamplexr
 # Load the libraries
 import numpy as np
 import matplotlib.pyplot as plt
-import copy
 import xarray as xr
 
 # === Stuff for the netcdf file handling ====
@@ -29,17 +30,22 @@ except:
 
 def reshapedict(ds, iplane, vvars):
     (Ny, Nx)=ds['x'][iplane,:,:].shape
-    ix = np.array([range(0,Nx) for i in range(0,Ny)]).reshape((Nx*Ny,1))
-    iy = np.array([[i]*Nx for i in range(0,Ny)]).reshape((Nx*Ny,1))
-    iz = np.array([[0]*Nx for i in range(0,Ny)]).reshape((Nx*Ny,1))
+    # Match the plane dtype so the hstack below doesn't upcast
+    # float32 sample data to float64
+    dtype = ds['x'].dtype
+    iy, ix = np.indices((Ny, Nx))
+    ix = ix.reshape((Nx*Ny,1)).astype(dtype)
+    iy = iy.reshape((Nx*Ny,1)).astype(dtype)
+    iz = np.zeros((Nx*Ny,1), dtype=dtype)
     xm = ds['x'][iplane,:,:].reshape((Nx*Ny,1))
     ym = ds['y'][iplane,:,:].reshape((Nx*Ny,1))
     zm = ds['z'][iplane,:,:].reshape((Nx*Ny,1))
-    outdat = np.hstack((iz, iy, ix, xm, ym, zm))
+    # Collect all columns first and stack once; growing the array with
+    # repeated hstack calls recopies the whole thing per variable
+    cols = [iz, iy, ix, xm, ym, zm]
     for v in vvars:
-        vdat = ds[v][iplane,:,:].reshape((Nx*Ny,1))
-        outdat = np.hstack((outdat, vdat))
-    return outdat
+        cols.append(ds[v][iplane,:,:].reshape((Nx*Ny,1)))
+    return np.hstack(cols)
 
 def avgNCplaneXR(ncfilename, tavg, group, iplane, verbose=False, replacenan=False):
     vvars = ['velocityx','velocityy','velocityz']
@@ -71,8 +77,8 @@ def avgNCPlane(ncfilename, tindices, filename, group='p_f', verbose=False):
     ally = ncdat[group].variables['coordinates'][:,1]
     allz = ncdat[group].variables['coordinates'][:,2]
     # -- Get the i,j indices ---
-    #ji=np.array([[j, i] for j in range(ncdat[group].ijk_dims[1]) for i in range(ncdat[group].ijk_dims[0])])
-    kji=np.array([[k, j, i] for k in range(ncdat[group].ijk_dims[2]) for j in range(ncdat[group].ijk_dims[1]) for i in range(ncdat[group].ijk_dims[0])])
+    # Build the (k,j,i) index triples without a Python triple loop
+    kji=np.indices(tuple(ncdat[group].ijk_dims[::-1])).reshape(3,-1).transpose()
     
     # Get the means 
     avgvx = np.mean(allvx[tindices, :], axis=0)
@@ -100,7 +106,7 @@ def extractNCplane(ncdat, tindex, group='p_f'):
     ally   = ncdat[group].variables['coordinates'][:,1]
     allz   = ncdat[group].variables['coordinates'][:,2]
     # -- Get the i,j indices ---
-    kji      = np.array([[k, j, i] for k in range(ncdat[group].ijk_dims[2]) for j in range(ncdat[group].ijk_dims[1]) for i in range(ncdat[group].ijk_dims[0])])
+    kji      = np.indices(tuple(ncdat[group].ijk_dims[::-1])).reshape(3,-1).transpose()
     slicevx  = allvx[tindex,:]
     slicevy  = allvy[tindex,:]
     slicevz  = allvz[tindex,:]
@@ -113,9 +119,12 @@ def extractNCplane(ncdat, tindex, group='p_f'):
 def loadplanefile(filename):
     dat=np.loadtxt(filename, skiprows=2)
     # Get the maximum indices
-    numplanes = int(max(dat[:,0]))
-    Numj      = int(max(dat[:,1]))
-    Numi      = int(max(dat[:,2]))
+    # Use the C reductions and round explicitly: int() alone truncates,
+    # which gets the index wrong if the text round-trip left it at
+    # something like 2.9999999999
+    numplanes = int(round(dat[:,0].max()))
+    Numj      = int(round(dat[:,1].max()))
+    Numi      = int(round(dat[:,2].max()))
     #print numplanes, Numi, Numj
     fname, fext = os.path.splitext(filename)
     if ((fext == '.gz') or (fext == '.GZ')):
@@ -152,19 +161,36 @@ def getvelocityindices(header):
             int(varstart+istart+2)]
 
 
-def avgplanefiles(filelist, verbose=False):
+def mapwindowed(pool, func, itemlist, nbuffer):
+    """
+    Apply func to itemlist through pool, like pool.map, but keep at
+    most nbuffer tasks submitted at a time.  Results are yielded in
+    order, so at most nbuffer of them are ever held in flight.
+    """
+    pending = deque()
+    for item in itemlist:
+        pending.append(pool.submit(func, item))
+        if len(pending) >= nbuffer:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+def avgplanefiles(filelist, verbose=False, nbuffer=8):
     """
     Average the plane files given in filelist
     """
     N = len(filelist)
-    for ifile, filename in enumerate(filelist):
-        if (verbose): 
-            print('Loading [%i/%i]: %s'%(ifile+1, N,os.path.basename(filename)))
-        dat, time, headers=loadplanefile(filename)
-        if (ifile==0): 
-            avgdat=dat
-        else:
-            avgdat=avgdat+dat
+    # Load the planes in parallel with a bounded submission window, so
+    # no more than nbuffer planes are resident beyond the running sum
+    with ThreadPoolExecutor(max_workers=nbuffer) as pool:
+        planeiter = mapwindowed(pool, loadplanefile, filelist, nbuffer)
+        for ifile, (dat, time, headers) in enumerate(planeiter):
+            if (verbose):
+                print('Loaded [%i/%i]: %s'%(ifile+1, N,os.path.basename(filelist[ifile])))
+            if (ifile==0):
+                avgdat=dat
+            else:
+                avgdat=avgdat+dat
     return avgdat/(float(N)), headers
 
 
@@ -208,10 +234,10 @@ def getsizesindices(dat, headers):
     # Get the indices for u, v, w velocities
     if len(headers)>0: iuvw = getvelocityindices(headers)
     else:              iuvw = []
-    Nplanes = max(dat[:,0])+1
-    Nj      = max(dat[:,1])+1
-    Ni      = max(dat[:,2])+1
-    return int(Ni), int(Nj), int(Nplanes), iuvw
+    Nplanes = dat[:,0].max()+1
+    Nj      = dat[:,1].max()+1
+    Ni      = dat[:,2].max()+1
+    return int(round(Ni)), int(round(Nj)), int(round(Nplanes)), iuvw
     
 def getplaneindex(i, j, iplane, Ni, Nj):
     return i + Ni*j + Nj*Ni*iplane
@@ -306,14 +332,35 @@ def makeRij(ij, allplist, filelist, loadfromplanes, avgsavefile, iplane, group,
         # Load the dataset
         ds=xr.open_dataset(ncfilename, group=group)
         reshapeijk = ds.attrs['ijk_dims'][::-1]
-        xm = ds['coordinates'].data[:,0].reshape(tuple(reshapeijk))
-        ym = ds['coordinates'].data[:,1].reshape(tuple(reshapeijk))
-        zm = ds['coordinates'].data[:,2].reshape(tuple(reshapeijk))
+        # Read the coordinates array once and slice the columns
+        allpts = ds['coordinates'].data
+        xm = allpts[:,0].reshape(tuple(reshapeijk))
+        ym = allpts[:,1].reshape(tuple(reshapeijk))
+        zm = allpts[:,2].reshape(tuple(reshapeijk))
         db = {}
         db['x'] = xm
         db['y'] = ym
         db['z'] = zm        
         
+    # Precompute the point indices and mean velocities for every probe
+    # list; these do not change from file to file
+    plistinfo = []
+    for plist in allplist:
+        p0   = sanitizepoint(plist[0], Ni, Nj, Nplanes)
+        i0   = getplaneindex(p0[0], p0[1], p0[2], Ni, Nj)
+        avguvw0 = [avgdat[i0,iuvw[0]],
+                   avgdat[i0,iuvw[1]],
+                   avgdat[i0,iuvw[2]]]
+        ptinfo = []
+        for ptx in plist:
+            pt    = sanitizepoint(ptx, Ni, Nj, Nplanes)
+            i1    = getplaneindex(pt[0], pt[1], pt[2], Ni, Nj)
+            avguvw1 = [avgdat[i1, iuvw[0]],
+                       avgdat[i1, iuvw[1]],
+                       avgdat[i1, iuvw[2]]]
+            ptinfo.append((i1, avguvw1))
+        plistinfo.append((i0, avguvw0, ptinfo))
+
     # -- Construct the Rij --
     # Loop through all files
     for ifile, filename in enumerate(filelist[::skip]):
@@ -334,22 +381,12 @@ def makeRij(ij, allplist, filelist, loadfromplanes, avgsavefile, iplane, group,
             dat = reshapedict(db, iplane, vvars)
         else:
             dat, time, headers=loadplanefile(filename)
-        for ilist, plist in enumerate(allplist):
-            p0   = sanitizepoint(plist[0], Ni, Nj, Nplanes) #plist[0]
-            i0   = getplaneindex(p0[0], p0[1], p0[2], Ni, Nj)
-            avguvw0 = [avgdat[i0,iuvw[0]], 
-                       avgdat[i0,iuvw[1]], 
-                       avgdat[i0,iuvw[2]]]
+        for ilist, (i0, avguvw0, ptinfo) in enumerate(plistinfo):
             u0   = dat[i0, iuvw[0]] - avguvw0[0]
             v0   = dat[i0, iuvw[1]] - avguvw0[1]
             w0   = dat[i0, iuvw[2]] - avguvw0[2]
             ulonglat0 = convertUVWtoLongLat([u0, v0, w0], avguvw0)
-            for ip, ptx in enumerate(plist):
-                pt    = sanitizepoint(ptx, Ni, Nj, Nplanes)
-                i1    = getplaneindex(pt[0], pt[1], pt[2], Ni, Nj)
-                avguvw1 = [avgdat[i1, iuvw[0]], 
-                           avgdat[i1, iuvw[1]], 
-                           avgdat[i1, iuvw[2]]]
+            for ip, (i1, avguvw1) in enumerate(ptinfo):
                 u1    = dat[i1, iuvw[0]] - avguvw1[0]
                 v1    = dat[i1, iuvw[1]] - avguvw1[1]
                 w1    = dat[i1, iuvw[2]] - avguvw1[2]
@@ -459,7 +496,9 @@ def makeprobeline(startpts, winddir, Lmin, dat):
         i0   = getplaneindex(p0[0], p0[1], p0[2], Ni, Nj)
         startxy = np.array(dat[i0, 3:6])
         Ltotal  = 0.0
-        plist   = [copy.deepcopy(p0)]
+        # p0/currptidx are flat [i, j, iplane] lists of ints, so a
+        # shallow list copy snapshots them without deepcopy overhead
+        plist   = [list(p0)]
         currpt  = startxy       # In physical space
         currptraster = startxy  # The current line tip, discretized
         currptidx    = p0
@@ -477,7 +516,7 @@ def makeprobeline(startpts, winddir, Lmin, dat):
                 currptraster[1] = currptraster[1] + dy
             #print('currptidx = '+repr(currptidx))
             #print('plist = '+repr(plist))
-            plist.append(copy.deepcopy(currptidx))
+            plist.append(list(currptidx))
             # Move to next point
             currpt = nextpt
         alllines.append(plist)
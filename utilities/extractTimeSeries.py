@@ -122,12 +122,13 @@ def getTimeSeries(ncdat, xvec, yvec, zvec, group,
                 xcol = xyzpt[0]*np.ones(len(t))
                 ycol = xyzpt[1]*np.ones(len(t))
                 zcol = xyzpt[2]*np.ones(len(t))
-                savedat = np.vstack((t, 
-                                     icol, jcol, kcol, 
-                                     xcol, ycol, zcol, 
-                                     u, v, w))
-                for vvar in extravars:
-                    savedat = np.vstack((savedat, extradat[vvar]))
+                # Stack all rows in one shot; growing savedat with
+                # repeated vstack recopies it for every extra variable
+                savedat = np.vstack((t,
+                                     icol, jcol, kcol,
+                                     xcol, ycol, zcol,
+                                     u, v, w)
+                                    + tuple(extradat[vvar] for vvar in extravars))
                 returndat[(x,y,z)] = savedat
                 if savestring != '':
                     fname=savestring%(x,y,z)
@@ -83,12 +83,11 @@ def datadict2file(datadict, filetemplate, varlist=['velocityx','velocityy','velo
         xcol   = data['x']*np.ones(N)
         ycol   = data['y']*np.ones(N)
         zcol   = data['z']*np.ones(N)
-        savedat = np.vstack((t, 
-                             icol, jcol, kcol, 
-                             xcol, ycol, zcol, 
-                             ))
-        for vvar in varlist:
-            savedat = np.vstack((savedat, data[vvar]))
+        # Stack all columns at once rather than growing savedat per variable
+        savedat = np.vstack((t,
+                             icol, jcol, kcol,
+                             xcol, ycol, zcol)
+                            + tuple(data[vvar] for vvar in varlist))
         fname=filetemplate.format(x=data['x'],y=data['y'],z=data['z'])
         headers="time i j k x y z "+' '.join(varlist)
         np.savetxt(fname, savedat.transpose(),header=headers)
@@ -20,6 +20,7 @@ import matplotlib.pyplot as plt
 from mpl_toolkits.axes_grid1 import make_axes_locatable
 import xarray as xr
 import argparse
+import json
 
 try:
     import argcomplete
@@ -29,6 +30,19 @@ except:
 
 extractvar = lambda xrds, var, i : xrds[var][i,:].data.reshape(tuple(xrds.attrs['ijk_dims'][::-1]))
 
+# Cache of evaluated levels expressions, keyed by the parameter string
+levelscache = {}
+
+def getlevels(paramdict):
+    """
+    Evaluate the levels parameter, reusing the cached result if the
+    same expression was evaluated before
+    """
+    levelstr = paramdict['levels']
+    if levelstr not in levelscache:
+        levelscache[levelstr] = eval(levelstr)  # np.linspace(6,12,101)
+    return levelscache[levelstr]
+
 def setfigtextsize(ax, fsize):
     for item in ([ax.title, ax.xaxis.label, ax.yaxis.label, ax.yaxis.get_offset_text()] + ax.get_xticklabels() + ax.get_yticklabels() ):
         item.set_fontsize(fsize)
@@ -47,8 +61,11 @@ def listinfo(ncfile, paramdict, verbose=0):
     print("Times:")
     g = groups[0] if paramdict['group'] is None else paramdict['group']
     with xr.open_dataset(ncfile, group=groups[0]) as ds:
-        xm = ds['coordinates'].data[:,0].reshape(tuple(ds.attrs['ijk_dims'][::-1]))
-        ym = ds['coordinates'].data[:,1].reshape(tuple(ds.attrs['ijk_dims'][::-1]))
+        # Read the coordinates array once and slice the columns
+        allpts = ds['coordinates'].data
+        reshapeijk = tuple(ds.attrs['ijk_dims'][::-1])
+        xm = allpts[:,0].reshape(reshapeijk)
+        ym = allpts[:,1].reshape(reshapeijk)
         dtime=xr.open_dataset(ncfile)
         ds = ds.assign_coords(coords={'xm':(['x','y','z'], xm),
                                       'ym':(['x','y','z'], ym),
@@ -67,8 +84,11 @@ def makeXYpng(ncfile, itimevec, savefile, paramdict, verbose=0):
     groups=ppsample.getGroups(ppsample.loadDataset(ncfile))
     g = groups[0] if paramdict['group'] is None else paramdict['group']
     with xr.open_dataset(ncfile, group=groups[0]) as ds:
-        xm = ds['coordinates'].data[:,0].reshape(tuple(ds.attrs['ijk_dims'][::-1]))
-        ym = ds['coordinates'].data[:,1].reshape(tuple(ds.attrs['ijk_dims'][::-1]))
+        # Read the coordinates array once and slice the columns
+        allpts = ds['coordinates'].data
+        reshapeijk = tuple(ds.attrs['ijk_dims'][::-1])
+        xm = allpts[:,0].reshape(reshapeijk)
+        ym = allpts[:,1].reshape(reshapeijk)
         dtime=xr.open_dataset(ncfile)
         ds = ds.assign_coords(coords={'xm':(['x','y','z'], xm),
                                       'ym':(['x','y','z'], ym),
@@ -76,7 +96,7 @@ def makeXYpng(ncfile, itimevec, savefile, paramdict, verbose=0):
                                      })
         dtime.close()
 
-        levels = eval(paramdict['levels']) # np.linspace(6,12,101)
+        levels = getlevels(paramdict)
         iplane = paramdict['iplane']
         for itime in itimevec:
             # Create a figure
@@ -110,9 +130,12 @@ def makeYZpng(ncfile, itimevec, savefile, paramdict, verbose=0):
     groups=ppsample.getGroups(ppsample.loadDataset(ncfile))
     g = groups[0] if paramdict['group'] is None else paramdict['group']
     with xr.open_dataset(ncfile, group=groups[0]) as ds:
-        xm = ds['coordinates'].data[:,0].reshape(tuple(ds.attrs['ijk_dims'][::-1]))
-        ym = ds['coordinates'].data[:,1].reshape(tuple(ds.attrs['ijk_dims'][::-1]))
-        zm = ds['coordinates'].data[:,2].reshape(tuple(ds.attrs['ijk_dims'][::-1]))
+        # Read the coordinates array once and slice the columns
+        allpts = ds['coordinates'].data
+        reshapeijk = tuple(ds.attrs['ijk_dims'][::-1])
+        xm = allpts[:,0].reshape(reshapeijk)
+        ym = allpts[:,1].reshape(reshapeijk)
+        zm = allpts[:,2].reshape(reshapeijk)
         dtime=xr.open_dataset(ncfile)
         ds = ds.assign_coords(coords={'xm':(['x','y','z'], xm),
                                       'ym':(['x','y','z'], ym),
@@ -122,7 +145,7 @@ def makeYZpng(ncfile, itimevec, savefile, paramdict, verbose=0):
         dtime.close()
 
         iplane = paramdict['iplane']
-        levels = eval(paramdict['levels']) 
+        levels = getlevels(paramdict)
         for itime in itimevec:
             # Create a figure
             fig, ax = plt.subplots(1,1,figsize=paramdict['figsize'], dpi=paramdict['dpi'])
@@ -157,9 +180,12 @@ def makeXZpng(ncfile, itimevec, savefile, paramdict, verbose=0):
     groups=ppsample.getGroups(ppsample.loadDataset(ncfile))
     g = groups[0] if paramdict['group'] is None else paramdict['group']
     with xr.open_dataset(ncfile, group=groups[0]) as ds:
-        xm = ds['coordinates'].data[:,0].reshape(tuple(ds.attrs['ijk_dims'][::-1]))
-        ym = ds['coordinates'].data[:,1].reshape(tuple(ds.attrs['ijk_dims'][::-1]))
-        zm = ds['coordinates'].data[:,2].reshape(tuple(ds.attrs['ijk_dims'][::-1]))
+        # Read the coordinates array once and slice the columns
+        allpts = ds['coordinates'].data
+        reshapeijk = tuple(ds.attrs['ijk_dims'][::-1])
+        xm = allpts[:,0].reshape(reshapeijk)
+        ym = allpts[:,1].reshape(reshapeijk)
+        zm = allpts[:,2].reshape(reshapeijk)
         dtime=xr.open_dataset(ncfile)
         ds = ds.assign_coords(coords={'xm':(['x','y','z'], xm),
                                       'ym':(['x','y','z'], ym),
@@ -168,7 +194,7 @@ def makeXZpng(ncfile, itimevec, savefile, paramdict, verbose=0):
                                      })
         dtime.close()
         iplane = paramdict['iplane']
-        levels = eval(paramdict['levels']) 
+        levels = getlevels(paramdict)
         for itime in itimevec:
             # Create a figure
             fig, ax = plt.subplots(1,1,figsize=paramdict['figsize'], dpi=paramdict['dpi'])
@@ -259,7 +285,12 @@ if __name__ == "__main__":
     verbose   = args.verbose
     printinfo = args.printinfo
     orient    = args.orientation
-    indict    = eval(args.paramdict)
+    # Try the JSON parser before falling back to eval (python-syntax
+    # dicts with single quotes still go through eval)
+    try:
+        indict = json.loads(args.paramdict)
+    except ValueError:
+        indict = eval(args.paramdict)
     defaultdict['xlabel'] = '%s [m]'%orient[0]
     defaultdict['ylabel'] = '%s [m]'%orient[1]
     defaultdict.update(indict)
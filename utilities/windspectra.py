@@ -4,6 +4,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
 
 # Defaults
 defaultwindow = {'choice':'tukey','alpha':0.1}
@@ -15,41 +17,61 @@ wKaimalconst  = {'a':2.1,   'b':5.3,  'alphaExp':5.0/3.0,'betaExp':1.0}
 # see https://en.wikipedia.org/wiki/Window_function#Tukey_window
 def tukeyWindow(N, params={'alpha':0.1}):
     alpha = params['alpha']
+    # With no taper region the window is identically one: skip the
+    # ramp construction entirely
+    if alpha <= 0.0:
+        return np.ones(N)
     w = np.zeros(N)
     L = N+1
-    for n in np.arange(0, int(N//2) + 1):
-        if ((0 <= n) and (n < 0.5*alpha*L)):
-            w[n] = 0.5*(1.0 - np.cos(2*np.pi*n/(alpha*L)))
-        elif ((0.5*alpha*L <= n) and (n <= N/2)):
-            w[n] = 1.0
-        else:
-            print("Something wrong happened at n = ",n)
-        if (n != 0): w[N-n] = w[n]
+    # Build the first half in one vectorized pass: cosine taper up to
+    # 0.5*alpha*L, then flat at 1.0, then mirror onto the second half
+    n     = np.arange(0, int(N//2) + 1)
+    whalf = np.ones(len(n))
+    nramp = n[n < 0.5*alpha*L]
+    whalf[:len(nramp)] = 0.5*(1.0 - np.cos(2*np.pi*nramp/(alpha*L)))
+    w[:len(n)]  = whalf
+    w[N - n[1:]] = whalf[1:]
     return w
 
 # FFT's a signal, returns 1-sided frequency and spectra (non-normalized)
 def getFFT(t, y):
     n    = len(y)
     k    = np.arange(n)
-    dt   = np.mean(np.diff(t))
+    # Mean spacing from the endpoints: the sum of diffs telescopes, so
+    # there is no need to materialize the full difference array
+    dt   = (t[-1]-t[0])/(len(t)-1)
     frq  = k/(n*dt)
     FFTy = np.fft.fft(y) # /(len(y))
     
-    # Take the one sided version of it
-    freq = frq[range(int(n//2))]
-    FFTy = FFTy[range(int(n//2))]
+    # Take the one sided version of it (basic slice, not a fancy-index copy)
+    freq = frq[:n//2]
+    FFTy = FFTy[:n//2]
     return freq, FFTy
 
+# Cache of computed windows, keyed by (N, alpha)
+windowcache = {}
+
+def getTukeyWindow(N, params={'alpha':0.1}):
+    """
+    Returns the Tukey window, reusing a cached copy if the same
+    (N, alpha) combination was computed before
+    """
+    key = (N, params['alpha'])
+    if key not in windowcache:
+        windowcache[key] = tukeyWindow(N, params=params)
+    return windowcache[key]
+
 # Takes a wind speed signal ws and returns the spectra
-#  Be sure to look at 
+#  Be sure to look at
 #  https://www.nwpsaf.eu/publications/tech_reports/nwpsaf-kn-tr-008.pdf
 #  for normalization!
 def getWindSpectra(t, ws, window=defaultwindow):
     N      = len(ws)
-    dt     = np.mean(np.diff(t))
+    # Mean spacing from the endpoints (telescoped sum of diffs)
+    dt     = (t[-1]-t[0])/(len(t)-1)
     # Get the window
-    if window['choice']=='tukey':    w = tukeyWindow(N, params=window)
-    else:                            w = 1 
+    if window['choice']=='tukey':    w = getTukeyWindow(N, params=window)
+    else:                            w = 1
     # FFT to get the coefficients
     f, fWS = getFFT(t, w*(ws-np.mean(ws)))
     Su     = dt/N*abs(fWS)**2
@@ -76,7 +98,7 @@ def avgWindSpectra(t, u, avgbins=[], window=defaultwindow):
             Savg = Su
         else:
             # Double check freqencies match
-            if (np.sum(np.abs(np.array(f)-np.array(favg))) > 1.0E-9):
+            if (np.sum(np.abs(f-favg)) > 1.0E-9):
                 print("frequencies in bins don't match!")
                 sys.exit(1)
             # Add to average
@@ -134,39 +156,54 @@ def convertUxytoLongLat(u, v):
  
 # Average the spectra over multiple locations
 # given by locations in planefilelist
-def avgSpectraFiles(planefilelist, zheight, datadir='.',verbose=True, avgbins=[]):
+# Submit at most nbuffer loads at a time and yield the results in
+# order, so a slow consumer never has more than nbuffer files in flight
+def loadwindowed(pool, loadfunc, filelist, nbuffer):
+    pending = deque()
+    for f in filelist:
+        pending.append(pool.submit(loadfunc, f))
+        if len(pending) >= nbuffer:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+def avgSpectraFiles(planefilelist, zheight, datadir='.',verbose=True, avgbins=[],
+                    nbuffer=8):
     # set initial values
     iplane = 0
     all_ulongavgs = []
     lent = 0
-    # Loop through and get spectra
-    for planefile in planefilelist:
-        if not os.path.isfile(datadir+'/'+planefile): continue
-        dat       = np.loadtxt(datadir+'/'+planefile, skiprows=1)
-        filterdat=dat[dat[:,3]==zheight,:]
-        t=filterdat[:,0]
-        u=filterdat[:,4]
-        v=filterdat[:,5]
-        w=filterdat[:,6]
-        #if ((iplane != 0) and (lent != len(t))): continue
-        if ((iplane != 0) and (len(t)<lent)): continue
-        if iplane == 0:    lent    = len(t)
-        if verbose: print("Loaded plane "+planefile)
-        all_ulongavgs.append(np.mean(u))
-        f, Suu      = avgWindSpectra(t[:lent], u[:lent], avgbins)
-        f, Svv      = avgWindSpectra(t[:lent], v[:lent], avgbins)
-        f, Sww      = avgWindSpectra(t[:lent], w[:lent], avgbins)
-        if iplane == 0:
-            lent    = len(t)
-            favg    = f
-            Suu_avg = Suu
-            Svv_avg = Svv
-            Sww_avg = Sww
-        else:
-            Suu_avg = Suu_avg + Suu
-            Svv_avg = Svv_avg + Svv
-            Sww_avg = Sww_avg + Sww
-        iplane = iplane+1
+    loadfile = lambda planefile: np.loadtxt(datadir+'/'+planefile, skiprows=1)
+    usefiles = [f for f in planefilelist if os.path.isfile(datadir+'/'+f)]
+    # Load the plane files in parallel with a bounded window, so the
+    # spectra loop below holds at most nbuffer files at a time
+    with ThreadPoolExecutor(max_workers=nbuffer) as pool:
+        datiter = loadwindowed(pool, loadfile, usefiles, nbuffer)
+        for planefile, dat in zip(usefiles, datiter):
+            filterdat=dat[dat[:,3]==zheight,:]
+            t=filterdat[:,0]
+            u=filterdat[:,4]
+            v=filterdat[:,5]
+            w=filterdat[:,6]
+            #if ((iplane != 0) and (lent != len(t))): continue
+            if ((iplane != 0) and (len(t)<lent)): continue
+            if iplane == 0:    lent    = len(t)
+            if verbose: print("Loaded plane "+planefile)
+            all_ulongavgs.append(np.mean(u))
+            f, Suu      = avgWindSpectra(t[:lent], u[:lent], avgbins)
+            f, Svv      = avgWindSpectra(t[:lent], v[:lent], avgbins)
+            f, Sww      = avgWindSpectra(t[:lent], w[:lent], avgbins)
+            if iplane == 0:
+                lent    = len(t)
+                favg    = f
+                Suu_avg = Suu
+                Svv_avg = Svv
+                Sww_avg = Sww
+            else:
+                Suu_avg = Suu_avg + Suu
+                Svv_avg = Svv_avg + Svv
+                Sww_avg = Sww_avg + Sww
+            iplane = iplane+1
     # Average the spectra
     Suu_avg = Suu_avg/iplane
     Svv_avg = Svv_avg/iplane
@@ -178,7 +215,8 @@ def NarrowToOctaveBand(freq, dat, n):
     """
     Convert dat from narrowband freq to 1/n octave band
     """
-    df = np.mean(np.diff(freq))
+    # Mean spacing from the endpoints (telescoped sum of diffs)
+    df = (freq[-1]-freq[0])/(len(freq)-1)
     lowf  = 1000 # Start at 1000 Hz
     prevf = lowf*(2**(1.0/n))
     while (prevf-lowf)>df:
@@ -194,15 +232,18 @@ def NarrowToOctaveBand(freq, dat, n):
     fhigh = [f*np.sqrt(2**(1.0/n)) for f in fcenter]
     bandw = np.array(fhigh)-np.array(flow)
 
-    # bin the data
+    # bin the data: one vectorized pass per band instead of a Python
+    # loop over every frequency (first matching band wins, as before)
     bindat   = np.zeros(len(fcenter))
     bincount = np.zeros(len(fcenter))
-    for fi, f in enumerate(freq):
-        for j in range(len(fcenter)):
-            if ((flow[j]<= f) and (f<fhigh[j])): 
-                bincount[j] += 1
-                bindat[j]   += dat[fi]
-                break
+    freqarr  = np.asarray(freq)
+    datarr   = np.asarray(dat)
+    assigned = np.zeros(len(freqarr), dtype=bool)
+    for j in range(len(fcenter)):
+        mask        = (~assigned) & (flow[j] <= freqarr) & (freqarr < fhigh[j])
+        bincount[j] = np.count_nonzero(mask)
+        bindat[j]   = np.sum(datarr[mask])
+        assigned   |= mask
 
     avgdat  = []
     avgflow = []
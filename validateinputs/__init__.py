@@ -23,10 +23,20 @@ validateinputs/
 
 # The list of all plugins is kept and built here
 pluginlist = []
+# Name -> plugin mapping, built at registration time so callers can look
+# up a plugin by name without scanning pluginlist
+plugindict = {}
 def registerplugin(f):
     pluginlist.append(f)
+    plugindict[f.name] = f
     return f
 
+def getplugin(name):
+    """
+    Returns the plugin registered under name
+    """
+    return plugindict[name]
+
 class CheckStatus(Enum):
     """
     Define the different check outcomes